@@ -2,21 +2,28 @@ import pygame
 import sys
 import math
 import os
-from collections import deque
+import subprocess
+import threading
 from datetime import datetime
-import control as ct
+from functools import lru_cache
 import numpy as np
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
-from reportlab.lib.units import inch
-from PIL import Image as PILImage
+try:
+    from numba import njit
+except ImportError:
+    # Sin numba los kernels se ejecutan como Python normal
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda funcion: funcion
 
 pygame.init()
 
 ANCHO, ALTO = 1600, 900
 FPS = 60
+SIM_DT = 1 / 20  # Paso fijo de la física y el PID (20 Hz)
+MAX_FRAME_DT = 0.25  # Tiempo máximo que se recupera tras un frame atascado
+HISTORIAL_MAX = 400
+TEXTO_CACHE_MAX = 512  # Superficies de texto renderizadas que se conservan
 
 BG_DARK = (10, 12, 20)
 BG_CARD = (20, 25, 40)
@@ -32,68 +39,157 @@ TEXT_PRIMARY = (250, 252, 255)
 TEXT_SECONDARY = (155, 170, 190)
 BORDER_COLOR = (60, 75, 100)
 
+# Geometría de los paneles (x, y, ancho, alto)
+PANEL_METRICAS = (50, 50, 700, 220)
+PANEL_CPU = (50, 300, 700, 450)
+PANEL_GRAFICA = (800, 50, 750, 700)
+
+# Aspas del ventilador: desfase angular de cada vértice según su posición t a lo largo del aspa
+_BLADE_T_POS = (0, 0.3, 0.6, 1.0)
+_BLADE_T_NEG = (1.0, 0.6, 0.3, 0)
+_BLADE_OFFSETS_POS = tuple(math.radians(25) * (1 - t) for t in _BLADE_T_POS)
+_BLADE_OFFSETS_NEG = tuple(math.radians(-25) * (1 - t) for t in _BLADE_T_NEG)
+# Contorno de un aspa sin rotar y con radio unitario
+_BLADE_TEMPLATE = np.array(
+    [(math.cos(offset) * (0.2 + t * 0.7), math.sin(offset) * (0.2 + t * 0.7))
+     for t, offset in zip(_BLADE_T_POS + _BLADE_T_NEG, _BLADE_OFFSETS_POS + _BLADE_OFFSETS_NEG)],
+    dtype=np.float32)
+# Las seis aspas ya rotadas i·60° y apiladas: un solo producto matricial por ventilador
+_ROTOR_TEMPLATE = np.concatenate([
+    _BLADE_TEMPLATE @ np.array([[math.cos(a), math.sin(a)], [-math.sin(a), math.cos(a)]], dtype=np.float32)
+    for a in (math.radians(i * 60) for i in range(6))])
+
+def _clamp(x, lo, hi):
+    return lo if x < lo else hi if x > hi else x
+
+# Versión compilada para usarla dentro de los kernels
+_clamp_nb = njit(cache=True, inline='always')(_clamp)
+
+@njit(cache=True, fastmath=True)
+def _pid_step(error, prev_error, integral, prev_output, kp, ki, kd, dt,
+              int_min, int_max, out_min, out_max, deadband):
+    if abs(error) < deadband and error < prev_error:
+        return prev_output, integral, error
+
+    p = kp * error
+
+    integral += error * dt
+    integral = _clamp_nb(integral, int_min, int_max)
+    i = ki * integral
+
+    derivative = (error - prev_error) / dt if dt > 0 else 0.0
+    d = kd * derivative
+
+    salida = p + i + d
+
+    salida_final = out_min + salida
+
+    salida_final = _clamp_nb(salida_final, out_min, out_max)
+
+    # Límite de variación por paso: 25 %/s lejos del setpoint, 15 %/s cerca (sin rama)
+    max_cambio = (15.0 + 10.0 * (error > 10)) * dt
+    salida_final = prev_output + _clamp_nb(salida_final - prev_output, -max_cambio, max_cambio)
+
+    return salida_final, integral, error
+
+@njit(cache=True, fastmath=True)
+def _step_cpu(temp, amb, carga, vel, tdp, cap, nk, fk, exp,
+              temp_critica, temp_maxima, t_sobrecalentamiento, dt):
+    carga_factor = (carga / 100.0)
+    watts_generados = carga_factor * tdp
+
+    delta_temp = temp - amb
+    if delta_temp < 0.01:
+        delta_temp = 0.01
+    p_pasiva = nk * delta_temp
+
+    fan_velocity_factor = (vel / 100.0) ** exp
+    p_activa = (fk * fan_velocity_factor) * delta_temp
+
+    p_enfriamiento_total = p_pasiva + p_activa
+
+    dTdt = (watts_generados - p_enfriamiento_total) / cap
+    temp += dTdt * dt
+
+    dañada = False
+
+    if temp < amb:
+        temp = amb
+
+    if temp >= temp_maxima:
+        temp = temp_maxima
+        dañada = True
+
+    if temp >= temp_critica:
+        t_sobrecalentamiento += dt
+        if t_sobrecalentamiento > 10.0:
+            dañada = True
+    else:
+        t_sobrecalentamiento -= dt * 2.0
+        if t_sobrecalentamiento < 0.0:
+            t_sobrecalentamiento = 0.0
+
+    return temp, dañada, t_sobrecalentamiento
+
+@njit(cache=True, fastmath=True)
+def _tick(temp, amb, carga, vel, prev_error, integral, prev_output,
+          tdp, cap, nk, fk, exp, temp_critica, temp_maxima, t_sobrecalentamiento,
+          kp, ki, kd, setpoint, int_min, int_max, out_min, out_max, deadband, pid_activo, dt):
+    """Paso completo de la simulación (PID + modelo térmico) en una sola llamada"""
+    if pid_activo:
+        vel, integral, prev_error = _pid_step(temp - setpoint, prev_error, integral, prev_output,
+                                              kp, ki, kd, dt, int_min, int_max, out_min, out_max, deadband)
+        prev_output = vel
+    else:
+        vel = 30.0
+
+    vel = _clamp_nb(vel, 0.0, 100.0)
+
+    temp, dañada, t_sobrecalentamiento = _step_cpu(temp, amb, carga, vel, tdp, cap, nk, fk, exp,
+                                                   temp_critica, temp_maxima, t_sobrecalentamiento, dt)
+
+    return temp, vel, prev_error, integral, prev_output, dañada, t_sobrecalentamiento
+
+def _abrir_reporte(ruta):
+    """Abre el PDF con el visor predeterminado del sistema"""
+    try:
+        if sys.platform.startswith('win'):
+            os.startfile(ruta)
+        elif sys.platform == 'darwin':
+            subprocess.Popen(['open', ruta])
+        else:
+            subprocess.Popen(['xdg-open', ruta])
+    except OSError:
+        # Sin visor disponible: el reporte igualmente queda guardado en disco
+        pass
+
 class ControladorPID:
     def __init__(self, kp=3.5, ki=0.25, kd=2.0, setpoint=75.0, 
                  output_limits=(30, 100), integrator_limits=(-50, 50)):
-        self.kp = kp
-        self.ki = ki
-        self.kd = kd
-        self.setpoint = setpoint
-        self.output_min, self.output_max = output_limits
-        self.int_min, self.int_max = integrator_limits
+        # Todo en float: los kernels JIT se especializan por tipo de argumento
+        self.kp, self.ki, self.kd = float(kp), float(ki), float(kd)
+        self.setpoint = float(setpoint)
+        self.output_min, self.output_max = map(float, output_limits)
+        self.int_min, self.int_max = map(float, integrator_limits)
 
         self._prev_error = 0.0
         self._integral = 0.0
         self._prev_output = 30.0
         
         self.deadband = 1.0
-        
-        self.Kp = ct.TransferFunction([kp], [1])
-        self.Ki = ct.TransferFunction([ki], [1, 0])
-        self.Kd = ct.TransferFunction([kd, 0], [1])
-        
-        self.pid_system = self.Kp + self.Ki + self.Kd
-        
-        self.state = np.array([0.0])
-        self.time_prev = 0.0
 
     def reiniciar(self):
         self._prev_error = 0.0
         self._integral = 0.0
         self._prev_output = 30.0
-        self.state = np.array([0.0])
 
     def calcular(self, medida, dt):
-        error = medida - self.setpoint
-        
-        if abs(error) < self.deadband and error < self._prev_error:
-            self._prev_error = error
-            return self._prev_output
-        
-        p = self.kp * error
-
-        self._integral += error * dt
-        self._integral = max(self.int_min, min(self.int_max, self._integral))
-        i = self.ki * self._integral
-
-        derivative = (error - self._prev_error) / dt if dt > 0 else 0.0
-        d = self.kd * derivative
-        self._prev_error = error
-
-        salida = p + i + d
-        
-        salida_final = self.output_min + salida
-        
-        salida_final = max(self.output_min, min(self.output_max, salida_final))
-        
-        if error > 10: 
-            max_cambio = 25.0 * dt
-        else:
-            max_cambio = 15.0 * dt
-        salida_final = self._prev_output + max(min(salida_final - self._prev_output, max_cambio), -max_cambio)
-        
-        self._prev_output = salida_final
-        return salida_final
+        salida, self._integral, self._prev_error = _pid_step(
+            medida - self.setpoint, self._prev_error, self._integral, self._prev_output,
+            self.kp, self.ki, self.kd, dt, self.int_min, self.int_max,
+            self.output_min, self.output_max, self.deadband)
+        self._prev_output = salida
+        return salida
 
 class ComputadoraSimulada:
     def __init__(self):
@@ -122,39 +218,18 @@ class ComputadoraSimulada:
         self.tiempo_sobrecalentamiento = 0.0
 
     def actualizar(self, velocidad_ventilador, dt=1/60):
-        velocidad_ventilador = max(0.0, min(100.0, velocidad_ventilador))
+        velocidad_ventilador = _clamp(velocidad_ventilador, 0.0, 100.0)
         self.velocidad_ventilador = velocidad_ventilador
 
-        carga_factor = (self.carga_cpu / 100.0)
-        watts_generados = carga_factor * self.tdp_max
-
-        delta_temp = max(0.01, self.temperatura - self.temp_ambiente)
-        p_pasiva = self.natural_k * delta_temp
-        
-        fan_velocity_factor = (velocidad_ventilador / 100.0) ** self.fan_curve_exp
-        p_activa = (self.fan_k * fan_velocity_factor) * delta_temp
-        
-        p_enfriamiento_total = p_pasiva + p_activa
-
-        dTdt = (watts_generados - p_enfriamiento_total) / self.thermal_capacity
-        self.temperatura += dTdt * dt
-
-        if self.temperatura < self.temp_ambiente:
-            self.temperatura = self.temp_ambiente
-
-        if self.temperatura >= self.temp_maxima:
-            self.temperatura = self.temp_maxima
+        self.temperatura, dañada, self.tiempo_sobrecalentamiento = _step_cpu(
+            self.temperatura, self.temp_ambiente, self.carga_cpu, velocidad_ventilador,
+            self.tdp_max, self.thermal_capacity, self.natural_k, self.fan_k, self.fan_curve_exp,
+            self.temp_critica, self.temp_maxima, self.tiempo_sobrecalentamiento, dt)
+        if dañada:
             self.dañada = True
 
-        if self.temperatura >= self.temp_critica:
-            self.tiempo_sobrecalentamiento += dt
-            if self.tiempo_sobrecalentamiento > 10.0:
-                self.dañada = True
-        else:
-            self.tiempo_sobrecalentamiento = max(0.0, self.tiempo_sobrecalentamiento - dt * 2.0)
-
     def ajustar_carga(self, nueva_carga):
-        self.carga_cpu = max(0.0, min(100.0, float(nueva_carga)))
+        self.carga_cpu = _clamp(float(nueva_carga), 0.0, 100.0)
 
     def esta_sobrecalentada(self):
         return self.temperatura >= self.temp_critica
@@ -170,27 +245,98 @@ class ComputadoraSimulada:
             return "CRÍTICA", ACCENT_RED
 
 class Boton:
-    def __init__(self, x, y, ancho, alto, texto, color=ACCENT_BLUE):
+    def __init__(self, x, y, ancho, alto, texto, fuente, color=ACCENT_BLUE):
         self.rect = pygame.Rect(x, y, ancho, alto)
         self.texto = texto
         self.color = color
         self.color_hover = tuple(min(c + 20, 255) for c in color)
+        self.fuente = fuente
         self.activo = False
-
-    def dibujar_boton(self, screen, fuente):
-        color = self.color_hover if self.activo else self.color
-        pygame.draw.rect(screen, color, self.rect, border_radius=10)
-        
-        border_color = tuple(min(c + 30, 255) for c in color) if self.activo else BORDER_COLOR
-        pygame.draw.rect(screen, border_color, self.rect, 2, border_radius=10)
-
-        texto_surf = fuente.render(self.texto, True, TEXT_PRIMARY)
-        texto_rect = texto_surf.get_rect(center=self.rect.center)
-        screen.blit(texto_surf, texto_rect)
+        self._clave = None
+        self._surf_normal = None
+        self._surf_hover = None
+
+    def _prerenderizar(self):
+        """Renderiza los dos aspectos del botón (normal y hover) en superficies propias"""
+        texto_surf = self.fuente.render(self.texto, True, TEXT_PRIMARY)
+        local = self.rect.move(-self.rect.x, -self.rect.y)
+        superficies = []
+        for activo in (False, True):
+            color = self.color_hover if activo else self.color
+            surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(surf, color, local, border_radius=10)
+
+            border_color = tuple(min(c + 30, 255) for c in color) if activo else BORDER_COLOR
+            pygame.draw.rect(surf, border_color, local, 2, border_radius=10)
+
+            surf.blit(texto_surf, texto_surf.get_rect(center=local.center))
+            superficies.append(surf.convert_alpha())
+        self._surf_normal, self._surf_hover = superficies
+        self._clave = (self.texto, self.color)
+
+    def superficie(self):
+        # Solo se vuelve a renderizar si cambió el texto o el color (botón PID)
+        if self._clave != (self.texto, self.color):
+            self._prerenderizar()
+        return self._surf_hover if self.activo else self._surf_normal
+
+    def invalidar(self):
+        self._clave = None
 
     def contiene_punto(self, pos):
         return self.rect.collidepoint(pos)
 
+@lru_cache(maxsize=None)
+def _estilos_reporte():
+    """Estilos del reporte PDF; se construyen una sola vez, en el primer reporte"""
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    styles = getSampleStyleSheet()
+    return {
+        'normal': styles['Normal'],
+        'titulo': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor=colors.HexColor('#4287f5'),
+            spaceAfter=30,
+            alignment=1
+        ),
+        'stats': ParagraphStyle(
+            'StatsTitle',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#28cd64'),
+            spaceAfter=12
+        ),
+        'vent': ParagraphStyle(
+            'VentTitle',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#a855f7'),
+            spaceAfter=12
+        ),
+        'pid': ParagraphStyle(
+            'PidTitle',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#ff8c1e'),
+            spaceAfter=12
+        ),
+        # Estilo común de las tablas; cada tabla solo añade el color de su encabezado
+        'tabla_base': [
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#1e1f28')),
+            ('TEXTCOLOR', (0, 1), (-1, -1), colors.whitesmoke),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#3c4b64')),
+        ],
+    }
+
 class GeneradorReportes:
     def __init__(self):
         self.ruta_reportes = "reportes"
@@ -199,6 +345,14 @@ class GeneradorReportes:
     
     def generar_reporte(self, computadora, pid, historial_temp, historial_vent, tiempo_total, pid_activado):
         """Genera un reporte PDF con los datos de la simulación"""
+        # reportlab se importa aquí para no cargarlo al arrancar si nunca se genera un reporte
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib import colors
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+        from reportlab.lib.units import inch
+
+        estilos = _estilos_reporte()
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         nombre_archivo = f"reporte_simulacion_{timestamp}.pdf"
         ruta_archivo = os.path.join(self.ruta_reportes, nombre_archivo)
@@ -210,18 +364,9 @@ class GeneradorReportes:
         
         # Contenido del documento
         story = []
-        styles = getSampleStyleSheet()
         
         # Título
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#4287f5'),
-            spaceAfter=30,
-            alignment=1
-        )
-        story.append(Paragraph("REPORTE DE SIMULACIÓN - SISTEMA DE CONTROL PID", title_style))
+        story.append(Paragraph("REPORTE DE SIMULACIÓN - SISTEMA DE CONTROL PID", estilos['titulo']))
         story.append(Spacer(1, 0.3*inch))
         
         # Información general
@@ -231,23 +376,15 @@ class GeneradorReportes:
         <b>Duración de la Simulación:</b> {tiempo_total:.2f} segundos<br/>
         <b>Control PID:</b> {'ACTIVADO' if pid_activado else 'DESACTIVADO'}<br/>
         """
-        story.append(Paragraph(info_general, styles['Normal']))
+        story.append(Paragraph(info_general, estilos['normal']))
         story.append(Spacer(1, 0.2*inch))
         
         if len(historial_temp) > 0:
-            temps = list(historial_temp)
-            temp_min = min(temps)
-            temp_max = max(temps)
-            temp_prom = sum(temps) / len(temps)
+            temp_min = float(historial_temp.min())
+            temp_max = float(historial_temp.max())
+            temp_prom = float(historial_temp.mean())
             
-            stats_title = ParagraphStyle(
-                'StatsTitle',
-                parent=styles['Heading2'],
-                fontSize=14,
-                textColor=colors.HexColor('#28cd64'),
-                spaceAfter=12
-            )
-            story.append(Paragraph("ESTADÍSTICAS DE TEMPERATURA", stats_title))
+            story.append(Paragraph("ESTADÍSTICAS DE TEMPERATURA", estilos['stats']))
             
             temp_data = [
                 ["Métrica", "Valor"],
@@ -259,34 +396,17 @@ class GeneradorReportes:
             ]
             
             temp_table = Table(temp_data, colWidths=[3*inch, 2.5*inch])
-            temp_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4287f5')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#1e1f28')),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.whitesmoke),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#3c4b64')),
-            ]))
+            temp_table.setStyle(TableStyle(
+                [('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4287f5'))] + estilos['tabla_base']))
             story.append(temp_table)
             story.append(Spacer(1, 0.2*inch))
         
         if len(historial_vent) > 0:
-            vents = list(historial_vent)
-            vent_min = min(vents)
-            vent_max = max(vents)
-            vent_prom = sum(vents) / len(vents)
+            vent_min = float(historial_vent.min())
+            vent_max = float(historial_vent.max())
+            vent_prom = float(historial_vent.mean())
             
-            vent_title = ParagraphStyle(
-                'VentTitle',
-                parent=styles['Heading2'],
-                fontSize=14,
-                textColor=colors.HexColor('#a855f7'),
-                spaceAfter=12
-            )
-            story.append(Paragraph("ESTADÍSTICAS DE VENTILADORES", vent_title))
+            story.append(Paragraph("ESTADÍSTICAS DE VENTILADORES", estilos['vent']))
             
             vent_data = [
                 ["Métrica", "Valor"],
@@ -296,28 +416,12 @@ class GeneradorReportes:
             ]
             
             vent_table = Table(vent_data, colWidths=[3*inch, 2.5*inch])
-            vent_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#a855f7')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 11),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#1e1f28')),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.whitesmoke),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#3c4b64')),
-            ]))
+            vent_table.setStyle(TableStyle(
+                [('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#a855f7'))] + estilos['tabla_base']))
             story.append(vent_table)
             story.append(Spacer(1, 0.2*inch))
 
-        pid_title = ParagraphStyle(
-            'PidTitle',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#ff8c1e'),
-            spaceAfter=12
-        )
-        story.append(Paragraph("PARÁMETROS DEL CONTROLADOR PID", pid_title))
+        story.append(Paragraph("PARÁMETROS DEL CONTROLADOR PID", estilos['pid']))
         
         pid_data = [
             ["Parámetro", "Valor"],
@@ -329,17 +433,8 @@ class GeneradorReportes:
         ]
         
         pid_table = Table(pid_data, colWidths=[3*inch, 2.5*inch])
-        pid_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ff8c1e')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#1e1f28')),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.whitesmoke),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#3c4b64')),
-        ]))
+        pid_table.setStyle(TableStyle(
+            [('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ff8c1e'))] + estilos['tabla_base']))
         story.append(pid_table)
         
         doc.build(story)
@@ -363,44 +458,235 @@ class Simulacion:
                                    output_limits=(30, 100), integrator_limits=(-25, 25))
         self.pid_activado = False
 
-        self.historial_temp = deque(maxlen=400)
-        self.historial_ventilador = deque(maxlen=400)
+        # Buffers circulares del historial (temperatura y velocidad de ventiladores).
+        # Cada muestra se escribe dos veces, en i e i + HISTORIAL_MAX, para que la
+        # ventana cronológica sea siempre un slice contiguo sin copias
+        self._temp_buf = np.empty(2 * HISTORIAL_MAX, dtype=np.float32)
+        self._vent_buf = np.empty(2 * HISTORIAL_MAX, dtype=np.float32)
+        self._hist_idx = 0
+        self._hist_count = 0
+        self._hist_version = 0
         self.tiempo_total = 0.0
+        self._sim_accum = 0.0
         
         # Generador de reportes
         self.generador_reportes = GeneradorReportes()
         self.mensaje_reporte = None
         self.tiempo_mensaje_reporte = 0.0
 
-        self.angulo_ventilador1 = 0.0
-        self.angulo_ventilador2 = 0.0
+        # Los dos ventiladores giran en sentidos opuestos a la misma velocidad
+        self.angulo_ventilador = 0.0
+
+        # Color del interior del chip: 64 niveles de intensidad por color de estado
+        self._overlay_lut = {
+            color: [tuple(int(c * t / 63 + b * (1 - t / 63)) for c, b in zip(color, BG_CARD_LIGHT))
+                    for t in range(64)]
+            for color in (ACCENT_BLUE, ACCENT_GREEN, ACCENT_ORANGE, ACCENT_RED)
+        }
+
+        self.btn_pid = Boton(50, 800, 200, 60, "PID: OFF", self.fuente_pequena, ACCENT_RED)
+        self.btn_reiniciar = Boton(270, 800, 200, 60, "Reiniciar", self.fuente_pequena, BG_CARD_LIGHT)
+        self.btn_reporte = Boton(1320, 800, 180, 60, "Generar Reporte", self.fuente_pequena, ACCENT_GREEN)
+
+        self.btn_idle = Boton(550, 800, 140, 60, "Idle (5%)", self.fuente_mini, ACCENT_BLUE)
+        self.btn_oficina = Boton(710, 800, 160, 60, "Oficina (30%)", self.fuente_mini, ACCENT_GREEN)
+        self.btn_gaming = Boton(890, 800, 160, 60, "Gaming (70%)", self.fuente_mini, ACCENT_ORANGE)
+        self.btn_render = Boton(1070, 800, 180, 60, "Render (100%)", self.fuente_mini, ACCENT_RED)
+
+        self.botones = [self.btn_pid, self.btn_reiniciar, self.btn_reporte,
+                        self.btn_idle, self.btn_oficina, self.btn_gaming, self.btn_render]
+        # Zonas que pueden cambiar incluso con la escena congelada: la fila de botones
+        # (un solo rectángulo, solo cuando cambia algún botón) y la franja del mensaje
+        self._rect_botones = self.botones[0].rect.unionall([btn.rect for btn in self.botones[1:]])
+        self._rect_mensaje = pygame.Rect(0, 15, ANCHO, 30)
+        self._botones_sucios = True
 
-        self.btn_pid = Boton(50, 800, 200, 60, "PID: OFF", ACCENT_RED)
-        self.btn_reiniciar = Boton(270, 800, 200, 60, "Reiniciar", BG_CARD_LIGHT)
-        self.btn_reporte = Boton(1320, 800, 180, 60, "Generar Reporte", ACCENT_GREEN)
+        self.corriendo = True
+        # Forzar flip completo (primer frame, cambio de modo, ventana expuesta)
+        self._redibujar_todo = True
+        self._dañada_mostrada = False
+        self._ultima_firma = None
+
+        # convert()/convert_alpha() necesitan que el modo de video ya esté configurado
+        assert pygame.display.get_surface() is not None, "set_mode debe llamarse antes de crear superficies"
+        self._construir_etiquetas()
+        self._text_cache = {}
+        self._fan_sprites = {}
+        self._construir_fondos()
+
+        # Compila los kernels numéricos antes de entrar al bucle principal
+        _pid_step(0.0, 0.0, 0.0, 30.0, 1.0, 0.0, 0.0, SIM_DT, -1.0, 1.0, 30.0, 100.0, 1.0)
+        _step_cpu(32.0, 24.0, 0.0, 30.0, 180.0, 150.0, 0.3, 6.0, 1.2, 95.0, 110.0, 0.0, SIM_DT)
+        _tick(32.0, 24.0, 0.0, 30.0, 0.0, 0.0, 30.0, 180.0, 150.0, 0.3, 6.0, 1.2, 95.0, 110.0, 0.0,
+              1.0, 0.0, 0.0, 75.0, -1.0, 1.0, 30.0, 100.0, 1.0, True, SIM_DT)
+
+    def _crear_superficie(self, ancho, alto):
+        return pygame.Surface((ancho, alto), pygame.SRCALPHA).convert_alpha()
+
+    def _dibujar_tarjeta(self, superficie, color_borde):
+        w, h = superficie.get_size()
+        pygame.draw.rect(superficie, BG_CARD, (0, 0, w, h), border_radius=15)
+        pygame.draw.rect(superficie, color_borde, (0, 0, w, h), 3, border_radius=15)
+        pygame.draw.rect(superficie, BORDER_COLOR, (2, 2, w-4, h-4), 1, border_radius=14)
+
+    def _render(self, fuente, texto, color):
+        """font.render memoizado por (fuente, texto, color); descarta las entradas más antiguas al llenarse"""
+        clave = (id(fuente), texto, color)
+        surf = self._text_cache.get(clave)
+        if surf is None:
+            surf = fuente.render(texto, True, color).convert_alpha()
+            if len(self._text_cache) >= TEXTO_CACHE_MAX:
+                del self._text_cache[next(iter(self._text_cache))]
+            self._text_cache[clave] = surf
+        return surf
+
+    def _construir_etiquetas(self):
+        """Renderiza una sola vez los textos fijos de la interfaz"""
+        etiquetas = [
+            ("Carga CPU:", self.fuente_pequena, TEXT_SECONDARY),
+            ("Ventiladores:", self.fuente_pequena, TEXT_SECONDARY),
+            ("Control PID:", self.fuente_pequena, TEXT_SECONDARY),
+            ("Setpoint:", self.fuente_pequena, TEXT_SECONDARY),
+            ("ACTIVO", self.fuente_pequena, TEXT_PRIMARY),
+            ("INACTIVO", self.fuente_pequena, TEXT_PRIMARY),
+            ("Setpoint", self.fuente_pequena, TEXT_PRIMARY),
+            ("TEMPERATURA CRÍTICA", self.fuente_media, ACCENT_RED),
+        ]
+        self._labels = {texto: fuente.render(texto, True, color).convert_alpha()
+                        for texto, fuente, color in etiquetas}
+
+        # Mensajes de sistema dañado, ya centrados
+        mensajes = [
+            ("¡SISTEMA DAÑADO!", self.fuente_grande, ALTO // 2 - 80),
+            ("La CPU se ha sobrecalentado", self.fuente_media, ALTO // 2),
+            ("Presiona 'Reiniciar' para comenzar de nuevo", self.fuente_pequena, ALTO // 2 + 60),
+        ]
+        self._mensajes_dañada = []
+        for texto, fuente, y in mensajes:
+            surf = fuente.render(texto, True, TEXT_PRIMARY).convert_alpha()
+            self._mensajes_dañada.append((surf, (ANCHO // 2 - surf.get_width() // 2, y)))
+
+    def _construir_fondos(self):
+        """Pre-renderiza toda la parte estática de la pantalla para blitearla en un solo paso por frame"""
+        # Panel de métricas: tarjeta, fondo de la barra y etiquetas de los marcadores
+        _, _, panel_w, panel_h = PANEL_METRICAS
+        bg_metricas = self._crear_superficie(panel_w, panel_h)
+        self._dibujar_tarjeta(bg_metricas, ACCENT_BLUE)
+
+        barra_x, barra_y = 30, 145
+        barra_w, barra_h = 640, 35
+        pygame.draw.rect(bg_metricas, BG_CARD_LIGHT, (barra_x, barra_y, barra_w, barra_h), border_radius=8)
 
-        self.btn_idle = Boton(550, 800, 140, 60, "Idle (5%)", ACCENT_BLUE)
-        self.btn_oficina = Boton(710, 800, 160, 60, "Oficina (30%)", ACCENT_GREEN)
-        self.btn_gaming = Boton(890, 800, 160, 60, "Gaming (70%)", ACCENT_ORANGE)
-        self.btn_render = Boton(1070, 800, 180, 60, "Render (100%)", ACCENT_RED)
+        for temp_marc, label in ((40, "40°"), (70, "70°"), (95, "95°")):
+            x_marc = barra_x + int((temp_marc / 100) * barra_w)
+            label_surf = self.fuente_mini.render(label, True, TEXT_SECONDARY)
+            bg_metricas.blit(label_surf, (x_marc - 15, barra_y + barra_h + 10))
 
-        self.corriendo = True
+        # Panel de CPU: tarjeta, título, base del chip y pines
+        _, _, panel_w, panel_h = PANEL_CPU
+        bg_cpu = self._crear_superficie(panel_w, panel_h)
+        self._dibujar_tarjeta(bg_cpu, ACCENT_PURPLE)
 
-    def manejar_eventos(self):
-        mouse_pos = pygame.mouse.get_pos()
+        titulo = self.fuente_titulo.render("VISUALIZACIÓN CPU", True, TEXT_PRIMARY)
+        bg_cpu.blit(titulo, (20, 20))
 
-        self.btn_pid.activo = self.btn_pid.contiene_punto(mouse_pos)
-        self.btn_reiniciar.activo = self.btn_reiniciar.contiene_punto(mouse_pos)
-        self.btn_reporte.activo = self.btn_reporte.contiene_punto(mouse_pos)
-        self.btn_idle.activo = self.btn_idle.contiene_punto(mouse_pos)
-        self.btn_oficina.activo = self.btn_oficina.contiene_punto(mouse_pos)
-        self.btn_gaming.activo = self.btn_gaming.contiene_punto(mouse_pos)
-        self.btn_render.activo = self.btn_render.contiene_punto(mouse_pos)
+        cpu_w, cpu_h = 200, 200
+        cpu_x = (panel_w - cpu_w) // 2
+        cpu_y = 120
+        pygame.draw.rect(bg_cpu, BG_CARD_LIGHT, (cpu_x, cpu_y, cpu_w, cpu_h), border_radius=10)
+
+        for i in range(8):
+            y_pin = cpu_y + 30 + i * 20
+            pygame.draw.rect(bg_cpu, BORDER_COLOR, (cpu_x - 15, y_pin, 10, 5))
+            pygame.draw.rect(bg_cpu, BORDER_COLOR, (cpu_x + cpu_w + 5, y_pin, 10, 5))
+
+        # Borde del chip, uno por color de estado
+        self._bordes_chip = {}
+        for color in (ACCENT_BLUE, ACCENT_GREEN, ACCENT_ORANGE, ACCENT_RED):
+            borde = self._crear_superficie(cpu_w, cpu_h)
+            pygame.draw.rect(borde, color, (0, 0, cpu_w, cpu_h), 3, border_radius=10)
+            self._bordes_chip[color] = borde
+
+        # Panel de gráfica: tarjeta, título, rejilla, umbrales y leyenda fija
+        _, _, panel_w, panel_h = PANEL_GRAFICA
+        bg_grafica = self._crear_superficie(panel_w, panel_h)
+        self._dibujar_tarjeta(bg_grafica, ACCENT_GREEN)
+
+        titulo = self.fuente_titulo.render("MONITOREO EN TIEMPO REAL", True, TEXT_PRIMARY)
+        bg_grafica.blit(titulo, (20, 20))
+
+        graf_x, graf_y = 50, 100
+        graf_w, graf_h = panel_w - 100, panel_h - 200
+
+        pygame.draw.rect(bg_grafica, BG_CARD_LIGHT, (graf_x, graf_y, graf_w, graf_h), border_radius=8)
+        pygame.draw.rect(bg_grafica, BORDER_COLOR, (graf_x, graf_y, graf_w, graf_h), 1, border_radius=8)
+
+        for i in range(6):
+            y = graf_y + (i * graf_h // 5)
+            pygame.draw.line(bg_grafica, BORDER_COLOR, (graf_x, y), (graf_x + graf_w, y), 1)
+            temp_label = 100 - (i * 20)
+            label_surf = self.fuente_mini.render(f"{temp_label}°C", True, TEXT_SECONDARY)
+            bg_grafica.blit(label_surf, (graf_x - 45, y - 8))
+
+        for temp_zona, color in ((95, ACCENT_RED), (70, ACCENT_ORANGE)):
+            y_zona = graf_y + graf_h - int((temp_zona / 100) * graf_h)
+            pygame.draw.line(bg_grafica, color, (graf_x, y_zona), (graf_x + graf_w, y_zona), 2)
+            zona_txt = self.fuente_mini.render(f"{temp_zona}°C", True, color)
+            bg_grafica.blit(zona_txt, (graf_x + graf_w + 10, y_zona - 8))
+
+        leyenda_y = panel_h - 70
+        leyenda_bg = pygame.Surface((panel_w - 40, 50)).convert()
+        leyenda_bg.set_alpha(50)
+        leyenda_bg.fill(BG_CARD_LIGHT)
+        bg_grafica.blit(leyenda_bg, (20, leyenda_y - 10))
+
+        for color, label, x_pos in ((ACCENT_RED, "Temperatura (°C)", graf_x),
+                                    (ACCENT_BLUE, "Velocidad Ventiladores (%)", graf_x + 220)):
+            pygame.draw.line(bg_grafica, color, (x_pos, leyenda_y), (x_pos + 30, leyenda_y), 3)
+            leg_surf = self.fuente_pequena.render(label, True, TEXT_PRIMARY)
+            bg_grafica.blit(leg_surf, (x_pos + 40, leyenda_y - 8))
+
+        # Fondo completo: bordes decorativos, paneles y rótulo de los perfiles de carga
+        self._bg_cache = pygame.Surface((ANCHO, ALTO)).convert()
+        self._bg_cache.fill(BG_DARK)
+        pygame.draw.line(self._bg_cache, ACCENT_BLUE, (0, 0), (ANCHO, 0), 2)
+        pygame.draw.line(self._bg_cache, ACCENT_BLUE, (0, ALTO-1), (ANCHO, ALTO-1), 2)
+
+        self._bg_cache.blit(bg_metricas, PANEL_METRICAS[:2])
+        self._bg_cache.blit(bg_cpu, PANEL_CPU[:2])
+        self._bg_cache.blit(bg_grafica, PANEL_GRAFICA[:2])
+
+        preset_label = self.fuente_pequena.render("Perfiles de Carga:", True, TEXT_SECONDARY)
+        self._bg_cache.blit(preset_label, (550, 775))
+
+        # Capa de las curvas, con 2 px de margen para el grosor de línea
+        self._graph_surf = self._crear_superficie(graf_w + 4, graf_h + 4)
+        self._graph_version = -1
 
+        # Capa roja de sistema dañado
+        self._overlay_dañada = pygame.Surface((ANCHO, ALTO)).convert()
+        self._overlay_dañada.set_alpha(200)
+        self._overlay_dañada.fill(ACCENT_RED)
+
+    def manejar_eventos(self):
         for evento in pygame.event.get():
             if evento.type == pygame.QUIT:
                 self.corriendo = False
 
+            elif evento.type == pygame.MOUSEMOTION:
+                for btn in self.botones:
+                    activo = btn.contiene_punto(evento.pos)
+                    if activo != btn.activo:
+                        btn.activo = activo
+                        self._botones_sucios = True
+
+            elif evento.type == pygame.WINDOWLEAVE:
+                # Sin consultar el ratón cada frame, el hover se limpia al salir de la ventana
+                for btn in self.botones:
+                    if btn.activo:
+                        btn.activo = False
+                        self._botones_sucios = True
+
             elif evento.type == pygame.KEYDOWN:
                 if evento.key == pygame.K_F11:
                     self.pantalla_completa = not self.pantalla_completa
@@ -408,12 +694,25 @@ class Simulacion:
                         self.screen = pygame.display.set_mode((ANCHO, ALTO), pygame.FULLSCREEN)
                     else:
                         self.screen = pygame.display.set_mode((ANCHO, ALTO), pygame.RESIZABLE)
+                    # El nuevo modo puede tener otro formato de píxel: reconvertir las cachés
+                    self._text_cache.clear()
+                    self._fan_sprites.clear()
+                    for btn in self.botones:
+                        btn.invalidar()
+                    self._construir_etiquetas()
+                    self._construir_fondos()
+                    self._redibujar_todo = True
+
+            elif evento.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                self._redibujar_todo = True
 
             elif evento.type == pygame.MOUSEBUTTONDOWN:
+                mouse_pos = evento.pos
                 if self.btn_pid.contiene_punto(mouse_pos):
                     self.pid_activado = not self.pid_activado
                     self.btn_pid.texto = "PID: ON" if self.pid_activado else "PID: OFF"
                     self.btn_pid.color = ACCENT_GREEN if self.pid_activado else ACCENT_RED
+                    self._botones_sucios = True
                     if self.pid_activado:
                         self.pid.reiniciar()
 
@@ -423,12 +722,12 @@ class Simulacion:
                 elif self.btn_reporte.contiene_punto(mouse_pos):
                     try:
                         nombre, ruta = self.generador_reportes.generar_reporte(
-                            self.computadora, self.pid, self.historial_temp, 
-                            self.historial_ventilador, self.tiempo_total, self.pid_activado
+                            self.computadora, self.pid, self._historial(self._temp_buf),
+                            self._historial(self._vent_buf), self.tiempo_total, self.pid_activado
                         )
                         self.mensaje_reporte = f"Reporte generado: {nombre}"
                         self.tiempo_mensaje_reporte = 5.0
-                        os.startfile(ruta)
+                        threading.Thread(target=_abrir_reporte, args=(ruta,), daemon=True).start()
                     except Exception as e:
                         self.mensaje_reporte = f"Error al generar reporte: {str(e)}"
                         self.tiempo_mensaje_reporte = 5.0
@@ -445,69 +744,91 @@ class Simulacion:
                 elif self.btn_render.contiene_punto(mouse_pos):
                     self.computadora.ajustar_carga(100)
 
+    def _historial(self, buf):
+        """Vista (sin copia) de las muestras de un buffer circular en orden cronológico"""
+        if self._hist_count < HISTORIAL_MAX:
+            return buf[:self._hist_count]
+        return buf[self._hist_idx:self._hist_idx + HISTORIAL_MAX]
+
     def reiniciar(self):
         self.computadora = ComputadoraSimulada()
         self.pid.reiniciar()
-        self.historial_temp.clear()
-        self.historial_ventilador.clear()
+        self._hist_idx = 0
+        self._hist_count = 0
+        self._hist_version += 1
         self.tiempo_total = 0.0
-        self.angulo_ventilador1 = 0.0
-        self.angulo_ventilador2 = 0.0
+        self.angulo_ventilador = 0.0
 
     def actualizar(self, dt):
         if self.computadora.dañada:
             return
 
-        if self.pid_activado:
-            velocidad = self.pid.calcular(self.computadora.temperatura, dt)
-        else:
-            velocidad = 30.0
+        cpu, pid = self.computadora, self.pid
+        (cpu.temperatura, cpu.velocidad_ventilador, pid._prev_error, pid._integral, pid._prev_output,
+         dañada, cpu.tiempo_sobrecalentamiento) = _tick(
+            cpu.temperatura, cpu.temp_ambiente, cpu.carga_cpu, cpu.velocidad_ventilador,
+            pid._prev_error, pid._integral, pid._prev_output,
+            cpu.tdp_max, cpu.thermal_capacity, cpu.natural_k, cpu.fan_k, cpu.fan_curve_exp,
+            cpu.temp_critica, cpu.temp_maxima, cpu.tiempo_sobrecalentamiento,
+            pid.kp, pid.ki, pid.kd, pid.setpoint, pid.int_min, pid.int_max,
+            pid.output_min, pid.output_max, pid.deadband, self.pid_activado, dt)
+        if dañada:
+            cpu.dañada = True
+
+        i = self._hist_idx
+        self._temp_buf[i] = self._temp_buf[i + HISTORIAL_MAX] = cpu.temperatura
+        self._vent_buf[i] = self._vent_buf[i + HISTORIAL_MAX] = cpu.velocidad_ventilador
+        self._hist_idx = (self._hist_idx + 1) % HISTORIAL_MAX
+        self._hist_count = min(HISTORIAL_MAX, self._hist_count + 1)
+        self._hist_version += 1
 
-        self.computadora.actualizar(velocidad, dt)
+        self.tiempo_total += dt
 
-        self.historial_temp.append(self.computadora.temperatura)
-        self.historial_ventilador.append(self.computadora.velocidad_ventilador)
+    def animar(self, dt):
+        """Avanza lo puramente visual a la tasa de render, independiente del paso de la física"""
+        if self.computadora.dañada:
+            return
 
-        velocidad_angular = self.computadora.velocidad_ventilador * 8.0
-        self.angulo_ventilador1 = (self.angulo_ventilador1 + velocidad_angular * dt) % 360
-        self.angulo_ventilador2 = (self.angulo_ventilador2 - velocidad_angular * dt) % 360
+        # Por debajo del 5 % el giro es imperceptible: el ventilador se queda quieto
+        # y se reutiliza el mismo sprite cacheado
+        if self.computadora.velocidad_ventilador >= 5.0:
+            velocidad_angular = self.computadora.velocidad_ventilador * 8.0
+            self.angulo_ventilador = (self.angulo_ventilador + velocidad_angular * dt) % 360
 
-        self.tiempo_total += dt
-        
         if self.tiempo_mensaje_reporte > 0:
             self.tiempo_mensaje_reporte -= dt
 
     def dibujar_ventilador(self, x, y, radio, angulo, color):
-        pygame.draw.circle(self.screen, BORDER_COLOR, (x, y), radio + 5, 3)
+        rect = pygame.draw.circle(self.screen, BORDER_COLOR, (x, y), radio + 5, 3)
         pygame.draw.circle(self.screen, BG_CARD, (x, y), radio)
 
-        num_aspas = 6
-        for i in range(num_aspas):
-            ang = math.radians(angulo + i * 60)
-            puntos = []
-            for t in [0, 0.3, 0.6, 1.0]:
-                r = radio * (0.2 + t * 0.7)
-                offset = math.radians(25) * (1 - t)
-                puntos.append((x + math.cos(ang + offset) * r, y + math.sin(ang + offset) * r))
-            for t in [1.0, 0.6, 0.3, 0]:
-                r = radio * (0.2 + t * 0.7)
-                offset = math.radians(-25) * (1 - t)
-                puntos.append((x + math.cos(ang + offset) * r, y + math.sin(ang + offset) * r))
-            pygame.draw.polygon(self.screen, color, puntos)
-
-        pygame.draw.circle(self.screen, BG_CARD_LIGHT, (x, y), radio * 0.25)
-        pygame.draw.circle(self.screen, color, (x, y), radio * 0.2)
+        # El rotor tiene simetría de 60°: basta con cachear 60 giros de 1° por color
+        clave = (radio, color, round(angulo) % 60)
+        sprite = self._fan_sprites.get(clave)
+        if sprite is None:
+            base = self._fan_sprites.get((radio, color))
+            if base is None:
+                base = self._sprite_ventilador(radio, color)
+                self._fan_sprites[(radio, color)] = base
+            sprite = pygame.transform.rotate(base, -clave[2])
+            self._fan_sprites[clave] = sprite
+        self.screen.blit(sprite, sprite.get_rect(center=(x, y)))
+        return rect
+
+    def _sprite_ventilador(self, radio, color):
+        """Aspas y buje de un ventilador sin rotar, sobre fondo transparente"""
+        lado = 2 * radio + 2
+        sprite = pygame.Surface((lado, lado), pygame.SRCALPHA)
+        centro = (lado // 2, lado // 2)
+        puntos = (_ROTOR_TEMPLATE * radio + centro).tolist()
+        for i in range(0, len(puntos), len(_BLADE_TEMPLATE)):
+            pygame.draw.polygon(sprite, color, puntos[i:i + len(_BLADE_TEMPLATE)])
+        pygame.draw.circle(sprite, BG_CARD_LIGHT, centro, radio * 0.25)
+        pygame.draw.circle(sprite, color, centro, radio * 0.2)
+        return sprite.convert_alpha()
 
     def dibujar_cpu_chip(self):
-        panel_x, panel_y = 50, 300
-        panel_w, panel_h = 700, 450
-
-        pygame.draw.rect(self.screen, BG_CARD, (panel_x, panel_y, panel_w, panel_h), border_radius=15)
-        pygame.draw.rect(self.screen, ACCENT_PURPLE, (panel_x, panel_y, panel_w, panel_h), 3, border_radius=15)
-        pygame.draw.rect(self.screen, BORDER_COLOR, (panel_x+2, panel_y+2, panel_w-4, panel_h-4), 1, border_radius=14)
-
-        titulo = self.fuente_titulo.render("VISUALIZACIÓN CPU", True, TEXT_PRIMARY)
-        self.screen.blit(titulo, (panel_x + 20, panel_y + 20))
+        panel_x, panel_y, panel_w, panel_h = PANEL_CPU
 
         cpu_w, cpu_h = 200, 200
         cpu_x = panel_x + (panel_w - cpu_w) // 2
@@ -515,18 +836,10 @@ class Simulacion:
 
         estado, color_temp = self.computadora.obtener_estado_temperatura()
 
-        pygame.draw.rect(self.screen, BG_CARD_LIGHT, (cpu_x, cpu_y, cpu_w, cpu_h), border_radius=10)
-
-        intensidad = min(1.0, (self.computadora.temperatura - 30) / 60)
-        overlay_color = tuple(int(c * intensidad + BG_CARD_LIGHT[i] * (1 - intensidad))
-                             for i, c in enumerate(color_temp))
+        idx = _clamp(int((self.computadora.temperatura - 30) * 64 / 60), 0, 63)
+        overlay_color = self._overlay_lut[color_temp][idx]
         pygame.draw.rect(self.screen, overlay_color, (cpu_x + 10, cpu_y + 10, cpu_w - 20, cpu_h - 20), border_radius=8)
-        pygame.draw.rect(self.screen, color_temp, (cpu_x, cpu_y, cpu_w, cpu_h), 3, border_radius=10)
-
-        for i in range(8):
-            y_pin = cpu_y + 30 + i * 20
-            pygame.draw.rect(self.screen, BORDER_COLOR, (cpu_x - 15, y_pin, 10, 5))
-            pygame.draw.rect(self.screen, BORDER_COLOR, (cpu_x + cpu_w + 5, y_pin, 10, 5))
+        self.screen.blit(self._bordes_chip[color_temp], (cpu_x, cpu_y))
 
         vent_color = ACCENT_GREEN
         if self.computadora.velocidad_ventilador > 50:
@@ -534,208 +847,187 @@ class Simulacion:
         if self.computadora.velocidad_ventilador > 75:
             vent_color = ACCENT_ORANGE
 
-        self.dibujar_ventilador(cpu_x - 100, cpu_y + cpu_h // 2, 60, self.angulo_ventilador1, vent_color)
-        self.dibujar_ventilador(cpu_x + cpu_w + 100, cpu_y + cpu_h // 2, 60, self.angulo_ventilador2, vent_color)
+        rect_vent1 = self.dibujar_ventilador(cpu_x - 100, cpu_y + cpu_h // 2, 60, self.angulo_ventilador, vent_color)
+        rect_vent2 = self.dibujar_ventilador(cpu_x + cpu_w + 100, cpu_y + cpu_h // 2, 60, -self.angulo_ventilador, vent_color)
 
         vel_text = f"{self.computadora.velocidad_ventilador:.0f}%"
-        vel_surf = self.fuente_pequena.render(vel_text, True, TEXT_SECONDARY)
+        vel_surf = self._render(self.fuente_pequena, vel_text, TEXT_SECONDARY)
         self.screen.blit(vel_surf, (cpu_x - 135, cpu_y + cpu_h // 2 + 75))
         self.screen.blit(vel_surf, (cpu_x + cpu_w + 65, cpu_y + cpu_h // 2 + 75))
 
         rpm = int(self.computadora.velocidad_ventilador * 20)
         rpm_text = f"{rpm} RPM"
-        rpm_surf = self.fuente_mini.render(rpm_text, True, TEXT_SECONDARY)
+        rpm_surf = self._render(self.fuente_mini, rpm_text, TEXT_SECONDARY)
         self.screen.blit(rpm_surf, (cpu_x - 135, cpu_y + cpu_h // 2 + 95))
         self.screen.blit(rpm_surf, (cpu_x + cpu_w + 65, cpu_y + cpu_h // 2 + 95))
 
-    def dibujar_panel_metricas(self):
-        panel_x, panel_y = 50, 50
-        panel_w, panel_h = 700, 220
+        # Cada ventilador se une con sus textos de velocidad/RPM, que quedan justo debajo
+        return [
+            pygame.Rect(cpu_x, cpu_y, cpu_w, cpu_h),
+            rect_vent1.union((cpu_x - 135, cpu_y + cpu_h // 2 + 75, 100, 40)),
+            rect_vent2.union((cpu_x + cpu_w + 65, cpu_y + cpu_h // 2 + 75, 100, 40)),
+        ]
 
-        pygame.draw.rect(self.screen, BG_CARD, (panel_x, panel_y, panel_w, panel_h), border_radius=15)
-        pygame.draw.rect(self.screen, ACCENT_BLUE, (panel_x, panel_y, panel_w, panel_h), 3, border_radius=15)
-        pygame.draw.rect(self.screen, BORDER_COLOR, (panel_x+2, panel_y+2, panel_w-4, panel_h-4), 1, border_radius=14)
+    def dibujar_panel_metricas(self):
+        panel_x, panel_y, panel_w, panel_h = PANEL_METRICAS
 
         estado, color_estado = self.computadora.obtener_estado_temperatura()
         temp_text = f"{self.computadora.temperatura:.1f}°C"
-        temp_surf = self.fuente_grande.render(temp_text, True, color_estado)
+        temp_surf = self._render(self.fuente_grande, temp_text, color_estado)
         self.screen.blit(temp_surf, (panel_x + 30, panel_y + 30))
 
-        estado_surf = self.fuente_media.render(estado, True, color_estado)
+        estado_surf = self._render(self.fuente_media, estado, color_estado)
         self.screen.blit(estado_surf, (panel_x + 30, panel_y + 95))
 
         barra_x, barra_y = panel_x + 30, panel_y + 145
         barra_w, barra_h = 640, 35
 
-        pygame.draw.rect(self.screen, BG_CARD_LIGHT, (barra_x, barra_y, barra_w, barra_h), border_radius=8)
-
         proporcion = min(1.0, self.computadora.temperatura / 100)
         relleno_w = int(barra_w * proporcion)
         pygame.draw.rect(self.screen, color_estado, (barra_x, barra_y, relleno_w, barra_h), border_radius=8)
 
-        marcadores = [(40, "40°", ACCENT_BLUE), (70, "70°", ACCENT_GREEN), (95, "95°", ACCENT_RED)]
+        marcadores = [(40, ACCENT_BLUE), (70, ACCENT_GREEN), (95, ACCENT_RED)]
 
-        for temp_marc, label, color in marcadores:
+        for temp_marc, color in marcadores:
             x_marc = barra_x + int((temp_marc / 100) * barra_w)
             pygame.draw.line(self.screen, color, (x_marc, barra_y - 5), (x_marc, barra_y + barra_h + 5), 2)
-            label_surf = self.fuente_mini.render(label, True, TEXT_SECONDARY)
-            self.screen.blit(label_surf, (x_marc - 15, barra_y + barra_h + 10))
 
         info_x, info_y = panel_x + 400, panel_y + 30
 
         labels = [
-            ("Carga CPU:", f"{self.computadora.carga_cpu:.0f}%"),
-            ("Ventiladores:", f"{self.computadora.velocidad_ventilador:.0f}%"),
-            ("Control PID:", "ACTIVO" if self.pid_activado else "INACTIVO"),
-            ("Setpoint:", f"{self.pid.setpoint:.0f}°C")
+            ("Carga CPU:", self._render(self.fuente_pequena, f"{self.computadora.carga_cpu:.0f}%", TEXT_PRIMARY)),
+            ("Ventiladores:", self._render(
+                self.fuente_pequena, f"{self.computadora.velocidad_ventilador:.0f}%", TEXT_PRIMARY)),
+            ("Control PID:", self._labels["ACTIVO" if self.pid_activado else "INACTIVO"]),
+            ("Setpoint:", self._render(self.fuente_pequena, f"{self.pid.setpoint:.0f}°C", TEXT_PRIMARY))
         ]
 
-        for i, (label, valor) in enumerate(labels):
+        for i, (label, valor_surf) in enumerate(labels):
             y = info_y + i * 30
-            label_surf = self.fuente_pequena.render(label, True, TEXT_SECONDARY)
-            self.screen.blit(label_surf, (info_x, y))
-
-            valor_surf = self.fuente_pequena.render(valor, True, TEXT_PRIMARY)
+            self.screen.blit(self._labels[label], (info_x, y))
             self.screen.blit(valor_surf, (info_x + 160, y))
 
-    def dibujar_grafica(self):
-        panel_x, panel_y = 800, 50
-        panel_w, panel_h = 750, 700
+        return [pygame.Rect(PANEL_METRICAS)]
 
-        pygame.draw.rect(self.screen, BG_CARD, (panel_x, panel_y, panel_w, panel_h), border_radius=15)
-        pygame.draw.rect(self.screen, ACCENT_GREEN, (panel_x, panel_y, panel_w, panel_h), 3, border_radius=15)
-        pygame.draw.rect(self.screen, BORDER_COLOR, (panel_x+2, panel_y+2, panel_w-4, panel_h-4), 1, border_radius=14)
-
-        titulo = self.fuente_titulo.render("MONITOREO EN TIEMPO REAL", True, TEXT_PRIMARY)
-        self.screen.blit(titulo, (panel_x + 20, panel_y + 20))
+    def dibujar_grafica(self):
+        panel_x, panel_y, panel_w, panel_h = PANEL_GRAFICA
 
         graf_x, graf_y = panel_x + 50, panel_y + 100
         graf_w, graf_h = panel_w - 100, panel_h - 200
 
-        pygame.draw.rect(self.screen, BG_CARD_LIGHT, (graf_x, graf_y, graf_w, graf_h), border_radius=8)
-        pygame.draw.rect(self.screen, BORDER_COLOR, (graf_x, graf_y, graf_w, graf_h), 1, border_radius=8)
-
-        for i in range(6):
-            y = graf_y + (i * graf_h // 5)
-            pygame.draw.line(self.screen, BORDER_COLOR, (graf_x, y), (graf_x + graf_w, y), 1)
-            temp_label = 100 - (i * 20)
-            label_surf = self.fuente_mini.render(f"{temp_label}°C", True, TEXT_SECONDARY)
-            self.screen.blit(label_surf, (graf_x - 45, y - 8))
-
-        y_critica = graf_y + graf_h - int((95 / 100) * graf_h)
-        y_segura = graf_y + graf_h - int((70 / 100) * graf_h)
         y_setpoint = graf_y + graf_h - int((self.pid.setpoint / 100) * graf_h)
 
-        pygame.draw.line(self.screen, ACCENT_RED, (graf_x, y_critica), (graf_x + graf_w, y_critica), 2)
-        zona_critica_txt = self.fuente_mini.render("95°C", True, ACCENT_RED)
-        self.screen.blit(zona_critica_txt, (graf_x + graf_w + 10, y_critica - 8))
-
-        pygame.draw.line(self.screen, ACCENT_ORANGE, (graf_x, y_segura), (graf_x + graf_w, y_segura), 2)
-        zona_segura_txt = self.fuente_mini.render("70°C", True, ACCENT_ORANGE)
-        self.screen.blit(zona_segura_txt, (graf_x + graf_w + 10, y_segura - 8))
-
         # Setpoint
         if self.pid_activado:
             pygame.draw.line(self.screen, ACCENT_YELLOW, (graf_x, y_setpoint), (graf_x + graf_w, y_setpoint), 2)
-            setpoint_txt = self.fuente_mini.render(f"{self.pid.setpoint:.0f}°C", True, ACCENT_YELLOW)
+            setpoint_txt = self._render(self.fuente_mini, f"{self.pid.setpoint:.0f}°C", ACCENT_YELLOW)
             self.screen.blit(setpoint_txt, (graf_x + graf_w + 10, y_setpoint - 8))
 
-        if len(self.historial_temp) > 1:
-            puntos_temp, puntos_vent = [], []
-
-            for i, temp in enumerate(self.historial_temp):
-                x = graf_x + (i / max(1, len(self.historial_temp) - 1)) * graf_w
-                y_temp = graf_y + graf_h - int((temp / 100) * graf_h)
-                puntos_temp.append((x, max(graf_y, min(graf_y + graf_h, y_temp))))
+        # Las curvas solo se vuelven a trazar cuando el historial ha cambiado
+        if self._graph_version != self._hist_version:
+            self._graph_surf.fill((0, 0, 0, 0))
+            if self._hist_count > 1:
+                temps = self._historial(self._temp_buf)
+                vents = self._historial(self._vent_buf)
 
-                if i < len(self.historial_ventilador):
-                    y_vent = graf_y + graf_h - int((self.historial_ventilador[i] / 100) * graf_h)
-                    puntos_vent.append((x, max(graf_y, min(graf_y + graf_h, y_vent))))
+                # Todas las coordenadas en una sola pasada vectorizada
+                xs = 2 + np.linspace(0, graf_w, self._hist_count).astype(np.int32)
+                ys_temp = 2 + graf_h - (np.clip(temps, 0, 100) * (graf_h / 100)).astype(np.int32)
+                ys_vent = 2 + graf_h - (np.clip(vents, 0, 100) * (graf_h / 100)).astype(np.int32)
 
-            if len(puntos_vent) > 1:
-                pygame.draw.lines(self.screen, ACCENT_BLUE, False, puntos_vent, 3)
-            if len(puntos_temp) > 1:
-                pygame.draw.lines(self.screen, ACCENT_RED, False, puntos_temp, 3)
+                pygame.draw.lines(self._graph_surf, ACCENT_BLUE, False, np.column_stack((xs, ys_vent)).tolist(), 3)
+                pygame.draw.lines(self._graph_surf, ACCENT_RED, False, np.column_stack((xs, ys_temp)).tolist(), 3)
+            self._graph_version = self._hist_version
+        self.screen.blit(self._graph_surf, (graf_x - 2, graf_y - 2))
 
         leyenda_y = panel_y + panel_h - 70
-        leyenda_bg_h = 50
-        leyenda_bg = pygame.Surface((panel_w - 40, leyenda_bg_h))
-        leyenda_bg.set_alpha(50)
-        leyenda_bg.fill(BG_CARD_LIGHT)
-        self.screen.blit(leyenda_bg, (panel_x + 20, leyenda_y - 10))
-
-        elementos_leyenda = [
-            (ACCENT_RED, "Temperatura (°C)", graf_x),
-            (ACCENT_BLUE, "Velocidad Ventiladores (%)", graf_x + 220),
-        ]
-        
+        x_pos = graf_x + 500
         if self.pid_activado:
-            elementos_leyenda.append((ACCENT_YELLOW, "Setpoint", graf_x + 500))
-
-        for color, label, x_pos in elementos_leyenda:
-            pygame.draw.line(self.screen, color, (x_pos, leyenda_y), (x_pos + 30, leyenda_y), 3)
-            leg_surf = self.fuente_pequena.render(label, True, TEXT_PRIMARY)
-            self.screen.blit(leg_surf, (x_pos + 40, leyenda_y - 8))
+            pygame.draw.line(self.screen, ACCENT_YELLOW, (x_pos, leyenda_y), (x_pos + 30, leyenda_y), 3)
+            self.screen.blit(self._labels["Setpoint"], (x_pos + 40, leyenda_y - 8))
+
+        # Área del trazado (con el grosor de línea) más las zonas del setpoint
+        return [
+            pygame.Rect(graf_x - 2, graf_y - 2, graf_w + 4, graf_h + 4),
+            pygame.Rect(graf_x + graf_w + 10, y_setpoint - 8, 40, 20),
+            pygame.Rect(x_pos, leyenda_y - 10, 150, 25),
+        ]
 
     def dibujar_advertencias(self):
         if self.computadora.dañada:
-            overlay = pygame.Surface((ANCHO, ALTO))
-            overlay.set_alpha(200)
-            overlay.fill(ACCENT_RED)
-            self.screen.blit(overlay, (0, 0))
+            rect = self.screen.blit(self._overlay_dañada, (0, 0))
+            self.screen.blits(self._mensajes_dañada, False)
+            return [rect]
 
-            msg1 = self.fuente_grande.render("¡SISTEMA DAÑADO!", True, TEXT_PRIMARY)
-            msg2 = self.fuente_media.render("La CPU se ha sobrecalentado", True, TEXT_PRIMARY)
-            msg3 = self.fuente_pequena.render("Presiona 'Reiniciar' para comenzar de nuevo", True, TEXT_PRIMARY)
-
-            self.screen.blit(msg1, (ANCHO // 2 - msg1.get_width() // 2, ALTO // 2 - 80))
-            self.screen.blit(msg2, (ANCHO // 2 - msg2.get_width() // 2, ALTO // 2))
-            self.screen.blit(msg3, (ANCHO // 2 - msg3.get_width() // 2, ALTO // 2 + 60))
-
-        elif self.computadora.esta_sobrecalentada():
+        if self.computadora.esta_sobrecalentada():
             if int(self.tiempo_total * 3) % 2 == 0:
-                warning_surf = self.fuente_media.render("TEMPERATURA CRÍTICA", True, ACCENT_RED)
+                warning_surf = self._labels["TEMPERATURA CRÍTICA"]
                 self.screen.blit(warning_surf, (ANCHO // 2 - warning_surf.get_width() // 2, 770))
+        return [pygame.Rect(0, 765, ANCHO, 30)]
 
     def dibujar(self):
-        self.screen.fill(BG_DARK)
-        
-        # Líneas decorativas en los bordes
-        pygame.draw.line(self.screen, ACCENT_BLUE, (0, 0), (ANCHO, 0), 2)
-        pygame.draw.line(self.screen, ACCENT_BLUE, (0, ALTO-1), (ANCHO, ALTO-1), 2)
+        if self._redibujar_todo:
+            # La ventana puede ser mayor que el fondo cacheado tras un redimensionado
+            self.screen.fill(BG_DARK)
+        self.screen.blit(self._bg_cache, (0, 0))
 
-        self.dibujar_panel_metricas()
-        self.dibujar_cpu_chip()
-        self.dibujar_grafica()
+        sucios = self.dibujar_panel_metricas()
+        sucios += self.dibujar_cpu_chip()
+        sucios += self.dibujar_grafica()
 
-        self.btn_pid.dibujar_boton(self.screen, self.fuente_pequena)
-        self.btn_reiniciar.dibujar_boton(self.screen, self.fuente_pequena)
-        self.btn_reporte.dibujar_boton(self.screen, self.fuente_pequena)
-
-        preset_label = self.fuente_pequena.render("Perfiles de Carga:", True, TEXT_SECONDARY)
-        self.screen.blit(preset_label, (550, 775))
+        # Todos los botones en una sola llamada
+        self.screen.blits([(btn.superficie(), btn.rect) for btn in self.botones], False)
 
-        self.btn_idle.dibujar_boton(self.screen, self.fuente_mini)
-        self.btn_oficina.dibujar_boton(self.screen, self.fuente_mini)
-        self.btn_gaming.dibujar_boton(self.screen, self.fuente_mini)
-        self.btn_render.dibujar_boton(self.screen, self.fuente_mini)
-        
         # Mostrar mensaje de reporte
         if self.tiempo_mensaje_reporte > 0 and self.mensaje_reporte:
-            msg_surf = self.fuente_pequena.render(self.mensaje_reporte, True, ACCENT_GREEN)
+            msg_surf = self._render(self.fuente_pequena, self.mensaje_reporte, ACCENT_GREEN)
             self.screen.blit(msg_surf, (ANCHO // 2 - msg_surf.get_width() // 2, 20))
 
-        self.dibujar_advertencias()
+        sucios += self.dibujar_advertencias()
+
+        interactivos = [self._rect_mensaje]
+        if self._botones_sucios:
+            interactivos.append(self._rect_botones)
+            self._botones_sucios = False
+
+        # Con la CPU dañada la escena queda congelada bajo la capa roja:
+        # tras el primer frame solo se actualizan botones y mensaje
+        dañada = self.computadora.dañada
+        if self._redibujar_todo or (self._dañada_mostrada and not dañada):
+            pygame.display.flip()
+            self._redibujar_todo = False
+        elif dañada and self._dañada_mostrada:
+            pygame.display.update(interactivos)
+        else:
+            pygame.display.update(sucios + interactivos)
+        self._dañada_mostrada = dañada
 
-        pygame.display.flip()
+    def _firma_visual(self):
+        """Todo el estado del que depende el frame; si no cambia, el frame sería idéntico"""
+        return (self._hist_version, round(self.angulo_ventilador), self.computadora.carga_cpu,
+                self.computadora.dañada, self.pid_activado,
+                self.mensaje_reporte if self.tiempo_mensaje_reporte > 0 else None)
 
     def ejecutar(self):
         while self.corriendo:
             dt = self.clock.tick(FPS) / 1000.0
 
             self.manejar_eventos()
-            self.actualizar(dt)
-            self.dibujar()
+
+            # Tras un bloqueo largo no se intenta recuperar todo el tiempo perdido
+            self._sim_accum += min(dt, MAX_FRAME_DT)
+            while self._sim_accum >= SIM_DT:
+                self.actualizar(SIM_DT)
+                self._sim_accum -= SIM_DT
+
+            self.animar(dt)
+
+            # Si nada visible ha cambiado (p. ej. CPU dañada o ventana en reposo) no se dibuja;
+            # los botones cambiados y los repintados completos pendientes fuerzan siempre el frame
+            firma = self._firma_visual()
+            if self._redibujar_todo or self._botones_sucios or firma != self._ultima_firma:
+                self.dibujar()
+                self._ultima_firma = firma
 
         pygame.quit()
         sys.exit()